@@ -6,16 +6,26 @@
 #     "rich>=13.9.0",
 #     "typer>=0.9.0",
 #     "questionary>=2.0.0",
+#     "orjson>=3.10.0",
 # ]
 # ///
 """Humane Tracker TUI - Explore habit tracker backup data with vi keybindings."""
 
-import json
+import hashlib
+import mmap
+import pickle
+import re
 import sys
-from collections import defaultdict
+import tempfile
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from functools import cached_property, lru_cache
+from operator import itemgetter
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
+import orjson
 import questionary
 import typer
 from rich.console import Console
@@ -29,6 +39,30 @@ from textual.screen import Screen
 from textual.widgets import DataTable, Footer, Header, Label, Static
 
 
+def _read_json(filepath: str) -> dict:
+    """Parse a JSON file straight from a read-only memory map, avoiding a copy."""
+    with open(filepath, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files can't be mapped, and not every filesystem supports mmap
+            return orjson.loads(f.read())
+        with mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def max_entry_per_day(entries: Iterable[dict]) -> dict[str, dict]:
+    """Map each day (YYYY-MM-DD) to its max-value entry; ties keep the first seen."""
+    best_by_date: dict[str, dict] = {}
+    for entry in entries:
+        date = entry["date"][:10]  # Normalize to YYYY-MM-DD
+        best = best_by_date.get(date)
+        # Values are numbers, not ints: 0.5 marks a partial day
+        if best is None or entry["value"] > best["value"]:
+            best_by_date[date] = entry
+    return best_by_date
+
+
 class HumaneData:
     """Load and analyze humane tracker backup data."""
 
@@ -36,41 +70,100 @@ class HumaneData:
         if data is not None:
             self.data = data
         elif filepath:
-            with open(filepath) as f:
-                self.data = json.load(f)
+            self.data = _read_json(filepath)
         else:
             raise ValueError("Must provide either filepath or data")
-        self.habits = {h["id"]: h for h in self.data.get("habits", [])}
+        (
+            self.habits,
+            self._entry_habit_ids,
+            self._entries_by_habit,
+            self._habits_by_category,
+        ) = self._build_indexes(self.data)
         self.entries = self.data.get("entries", [])
 
-    def get_categories(self) -> dict[str, list[dict]]:
-        """Group habits by category."""
-        categories = defaultdict(list)
-        for habit in self.data.get("habits", []):
-            categories[habit.get("category", "uncategorized")].append(habit)
-        return dict(categories)
+        self._habit_names = {hid: h.get("name", "Unknown") for hid, h in self.habits.items()}
+
+        # Lowercased names for case-insensitive search, paired with their habit
+        self._habit_names_lower: list[tuple[str, dict]] = [
+            (h.get("name", "").lower(), h) for h in self.data.get("habits", [])
+        ]
 
-    def get_habits_by_category(self, category: str) -> list[dict]:
-        """Get all habits in a category."""
-        return [h for h in self.data.get("habits", []) if h.get("category") == category]
+    @staticmethod
+    def _build_indexes(
+        data: dict,
+    ) -> tuple[dict[str, dict], list[str], dict[str, tuple[dict, ...]], dict[str, tuple[dict, ...]]]:
+        """Build (habits by id, entry habit-id column, entries by habit, habits by category)."""
+        # Habit ids repeat across every entry; interning them lets the id
+        # comparisons and dict lookups below hit the identity fast path
+        for habit in data.get("habits", []):
+            habit["id"] = sys.intern(habit["id"])
+        habits = {h["id"]: h for h in data.get("habits", [])}
+
+        # Bucket entries by habit once so per-habit lookups don't rescan everything,
+        # and keep the habit ids as a column parallel to the entries for merges
+        entries_by_habit: dict[str, list[dict]] = defaultdict(list)
+        entry_habit_ids: list[str] = []
+        for entry in data.get("entries", []):
+            habit_id = entry["habitId"] = sys.intern(entry["habitId"])
+            entries_by_habit[habit_id].append(entry)
+            entry_habit_ids.append(habit_id)
+        # Screens list entries newest first; sort each bucket once instead of per view.
+        # Buckets are frozen to tuples so accessors can hand them out without copying.
+        entries_by_habit_sorted = {
+            habit_id: tuple(sorted(habit_entries, key=itemgetter("date"), reverse=True))
+            for habit_id, habit_entries in entries_by_habit.items()
+        }
+
+        # Group habits by category, each group pre-sorted by name for the screens;
+        # name is optional in a backup, so unnamed habits sort first
+        habits_by_category: dict[str, list[dict]] = defaultdict(list)
+        for habit in sorted(data.get("habits", []), key=lambda h: h.get("name", "")):
+            habits_by_category[habit.get("category", "uncategorized")].append(habit)
+        habits_by_category_sorted = {
+            category: tuple(group) for category, group in habits_by_category.items()
+        }
+        return habits, entry_habit_ids, entries_by_habit_sorted, habits_by_category_sorted
+
+    def get_categories(self) -> Mapping[str, tuple[dict, ...]]:
+        """Group habits by category, each group sorted by name (read-only view)."""
+        return MappingProxyType(self._habits_by_category)
 
-    def get_entries_for_habit(self, habit_id: str) -> list[dict]:
-        """Get all entries for a habit."""
-        return [e for e in self.entries if e.get("habitId") == habit_id]
+    def get_habits_by_category(self, category: str) -> tuple[dict, ...]:
+        """Get all habits in a category, sorted by name."""
+        return self._habits_by_category.get(category, ())
+
+    def get_entries_for_habit(self, habit_id: str) -> tuple[dict, ...]:
+        """Get all entries for a habit, newest first."""
+        return self._entries_by_habit.get(habit_id, ())
 
     def get_habit_name(self, habit_id: str) -> str:
         """Get habit name by ID."""
-        habit = self.habits.get(habit_id)
-        return habit.get("name", "Unknown") if habit else "Unknown"
+        return self._habit_names.get(habit_id, "Unknown")
+
+    def find_habits(self, pattern: str, *more_patterns: str) -> list[dict]:
+        """Find habits whose name contains any pattern, case-insensitively."""
+        if not more_patterns:
+            pattern_lower = pattern.lower()
+            return [h for name_lower, h in self._habit_names_lower if pattern_lower in name_lower]
+
+        # Several terms: one compiled alternation scans each name once in C
+        matcher = _compile_name_patterns((pattern, *more_patterns))
+        return [h for name_lower, h in self._habit_names_lower if matcher.search(name_lower)]
 
-    def get_category_stats(self) -> list[tuple[str, int, int]]:
+    def get_category_stats(self) -> tuple[tuple[str, int, int], ...]:
         """Get (category, habit_count, total_target) tuples."""
-        categories = self.get_categories()
-        stats = []
-        for cat, habits in sorted(categories.items()):
-            total_target = sum(h.get("targetPerWeek", 0) for h in habits)
-            stats.append((cat, len(habits), total_target))
-        return stats
+        return self._category_stats
+
+    @cached_property
+    def _category_stats(self) -> tuple[tuple[str, int, int], ...]:
+        # Computed on first use; the loaded data is never mutated
+        counts: Counter[str] = Counter()
+        totals: Counter[str] = Counter()
+        for habit in self.data.get("habits", []):
+            category = habit.get("category", "uncategorized")
+            counts[category] += 1
+            totals[category] += habit.get("targetPerWeek", 0)
+        return tuple((cat, counts[cat], totals[cat]) for cat in sorted(counts))
 
     def merge_habits(self, target_habit_id: str, source_habit_ids: list[str]) -> dict:
         """Merge multiple habits into one, taking max value on duplicate days.
@@ -82,33 +175,31 @@ class HumaneData:
         Returns:
             New data dict with merged habits and entries
         """
-        all_source_ids = set(source_habit_ids)
-        if target_habit_id in all_source_ids:
-            all_source_ids.remove(target_habit_id)
-
-        # Collect all entries for target and sources, grouped by date
-        entries_by_date: dict[str, list[dict]] = defaultdict(list)
-        for entry in self.entries:
-            if entry.get("habitId") == target_habit_id or entry.get("habitId") in all_source_ids:
-                date = entry.get("date", "")[:10]  # Normalize to YYYY-MM-DD
-                entries_by_date[date].append(entry)
-
-        # Create merged entries - take max value per day
-        merged_entries = []
-        for date, day_entries in entries_by_date.items():
-            max_entry = max(day_entries, key=lambda e: e.get("value", 0))
-            merged_entries.append({
+        all_source_ids = frozenset(source_habit_ids) - {target_habit_id}
+        involved_ids = all_source_ids | {target_habit_id}
+
+        # Split entries into those involved in the merge and the rest, in one pass
+        involved_entries: list[dict] = []
+        other_entries: list[dict] = []
+        for habit_id, entry in zip(self._entry_habit_ids, self.entries, strict=True):
+            if habit_id in involved_ids:
+                involved_entries.append(entry)
+            else:
+                other_entries.append(entry)
+
+        # Keep only the max-value entry per day across target and sources
+        best_by_date = max_entry_per_day(involved_entries)
+
+        # Create merged entries, one per day, all under the target habit
+        merged_entries = [
+            {
                 "id": max_entry["id"],
                 "habitId": target_habit_id,
                 "date": date,
-                "value": max_entry.get("value", 0),
+                "value": max_entry["value"],
                 "createdAt": max_entry.get("createdAt", ""),
-            })
-
-        # Keep entries not involved in the merge
-        other_entries = [
-            e for e in self.entries
-            if e.get("habitId") != target_habit_id and e.get("habitId") not in all_source_ids
+            }
+            for date, max_entry in best_by_date.items()
         ]
 
         # Remove source habits from habits list
@@ -152,8 +243,11 @@ class CategoriesScreen(Screen):
         table.zebra_stripes = True
         table.add_columns("Category", "Habits", "Weekly Target")
 
-        for cat, count, target in self.humane_data.get_category_stats():
-            table.add_row(cat.capitalize(), str(count), str(target), key=cat)
+        # Rows need keys, so they go in one by one; add_row only marks the table
+        # for re-layout on the next idle, and batch_update holds any repaint until done
+        with self.app.batch_update():
+            for cat, count, target in self.humane_data.get_category_stats():
+                table.add_row(cat.capitalize(), str(count), str(target), key=cat)
 
         table.focus()
 
@@ -216,14 +310,15 @@ class HabitsScreen(Screen):
         table.zebra_stripes = True
         table.add_columns("Name", "Target/Week", "Entries")
 
-        for habit in sorted(self.habits, key=lambda h: h.get("name", "")):
-            entry_count = len(self.humane_data.get_entries_for_habit(habit["id"]))
-            table.add_row(
-                habit.get("name", "Unknown"),
-                str(habit.get("targetPerWeek", 0)),
-                str(entry_count),
-                key=habit["id"],
-            )
+        with self.app.batch_update():
+            for habit in self.habits:
+                entry_count = len(self.humane_data.get_entries_for_habit(habit["id"]))
+                table.add_row(
+                    habit.get("name", "Unknown"),
+                    str(habit.get("targetPerWeek", 0)),
+                    str(entry_count),
+                    key=habit["id"],
+                )
 
         table.focus()
 
@@ -290,13 +385,15 @@ class EntriesScreen(Screen):
         table.zebra_stripes = True
         table.add_columns("Date", "Value", "Created At")
 
-        for entry in sorted(self.entries, key=lambda e: e.get("date", ""), reverse=True):
-            date_str = entry.get("date", "")[:10]
-            created_str = entry.get("createdAt", "")[:10]
-            table.add_row(date_str, str(entry.get("value", 0)), created_str)
+        rows = [
+            (entry.get("date", "")[:10], str(entry.get("value", 0)), entry.get("createdAt", "")[:10])
+            for entry in self.entries
+        ]
+        if not rows:
+            rows.append(("No entries", "-", "-"))
 
-        if not self.entries:
-            table.add_row("No entries", "-", "-")
+        with self.app.batch_update():
+            table.add_rows(rows)
 
         table.focus()
 
@@ -412,11 +509,19 @@ class HumaneCLI(App):
 cli = typer.Typer(help="Humane Tracker CLI - Explore and manage habit tracker backup data")
 console = Console()
 
+# Parsed backups are pickled here so repeat CLI runs on an unchanged file skip the JSON parse
+CACHE_DIR = Path.home() / ".cache" / "humane-tracker"
+
+
+@lru_cache(maxsize=64)
+def _compile_name_patterns(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile lowercased patterns into one literal alternation."""
+    return re.compile("|".join(re.escape(p.lower()) for p in patterns))
+
 
-def find_habits_by_name(humane_data: HumaneData, pattern: str) -> list[dict]:
-    """Find habits matching a pattern (case-insensitive substring match)."""
-    pattern_lower = pattern.lower()
-    return [h for h in humane_data.data.get("habits", []) if pattern_lower in h.get("name", "").lower()]
+def find_habits_by_name(humane_data: HumaneData, pattern: str, *more_patterns: str) -> list[dict]:
+    """Find habits matching any pattern (case-insensitive substring match)."""
+    return humane_data.find_habits(pattern, *more_patterns)
 
 
 def get_default_backup_path() -> Path | None:
@@ -428,6 +533,23 @@ def get_default_backup_path() -> Path | None:
     return None
 
 
+def get_cache_path(file: Path) -> Path:
+    """Cache location for a parsed backup: one file per backup path."""
+    key = str(file.resolve())
+    return CACHE_DIR / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pkl"
+
+
+def _cache_stamp(file: Path) -> tuple:
+    """What a cached parse must match to be reused.
+
+    The file's mtime and size, plus this module's name and mtime: an edited
+    HumaneData never unpickles a stale layout, and running as a script
+    (__main__) never reads a pickle that references humane_cli, or vice versa.
+    """
+    stat = file.stat()
+    return (stat.st_mtime_ns, stat.st_size, __name__, Path(__file__).stat().st_mtime_ns)
+
+
 def load_data(file: Path | None) -> HumaneData:
     """Load data from file or default backup."""
     if file is None:
@@ -441,7 +563,35 @@ def load_data(file: Path | None) -> HumaneData:
         console.print(f"[red]Error: File not found: {file}[/red]")
         raise typer.Exit(1)
 
-    return HumaneData(str(file))
+    # The stamp is pickled ahead of the data and checked first, so a stale entry
+    # is never unpickled; it is overwritten below, keeping one file per backup
+    cache_path = get_cache_path(file)
+    stamp = _cache_stamp(file)
+    try:
+        with cache_path.open("rb") as f:
+            if pickle.load(f) == stamp:
+                return pickle.load(f)
+    except Exception:
+        pass  # A missing, truncated or corrupt cache is just a miss
+
+    data = HumaneData(str(file))
+    tmp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # A private temp file per writer, so concurrent runs never share one
+        # half-written file; replace() then swaps the finished file in atomically
+        with tempfile.NamedTemporaryFile(
+            dir=cache_path.parent, prefix=cache_path.stem, suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = Path(f.name)
+            pickle.dump(stamp, f, protocol=5)
+            pickle.dump(data, f, protocol=5)
+        tmp_path.replace(cache_path)
+    except OSError:
+        # Caching is best-effort; a read-only home shouldn't break loading
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+    return data
 
 
 @cli.command()
@@ -465,7 +615,7 @@ def list_habits(
     for cat, habits in sorted(categories.items()):
         console.print(f"\n[bold]{cat.upper()}[/bold]")
         console.print("-" * 40)
-        for h in sorted(habits, key=lambda x: x.get("name", "")):
+        for h in habits:
             entry_count = len(data.get_entries_for_habit(h["id"]))
             console.print(f"  {h['name']:<30} ({entry_count:>3} entries)")
 
@@ -487,9 +637,11 @@ def merge(
         console.print("[red]Error: Need at least 2 habits to merge[/red]")
         raise typer.Exit(1)
 
+    # Count entries once per habit; both prompts and the summary reuse them
+    entry_counts = {h["id"]: len(data.get_entries_for_habit(h["id"])) for h in habits}
+
     def habit_choice(h: dict) -> questionary.Choice:
-        entry_count = len(data.get_entries_for_habit(h["id"]))
-        label = f"{h['name']} ({entry_count} entries) [{h.get('category', 'uncategorized')}]"
+        label = f"{h['name']} ({entry_counts[h['id']]} entries) [{h.get('category', 'uncategorized')}]"
         return questionary.Choice(title=label, value=h)
 
     sorted_habits = sorted(habits, key=lambda h: (h.get("category", ""), h.get("name", "")))
@@ -520,8 +672,7 @@ def merge(
     console.print(f"  Target: [green]{target['name']}[/green]")
     console.print("  Sources to merge and remove:")
     for s in sources:
-        entry_count = len(data.get_entries_for_habit(s["id"]))
-        console.print(f"    - [red]{s['name']}[/red] ({entry_count} entries)")
+        console.print(f"    - [red]{s['name']}[/red] ({entry_counts[s['id']]} entries)")
 
     if not questionary.confirm("Proceed with merge?", default=False).ask():
         console.print("[yellow]Cancelled.[/yellow]")
@@ -532,16 +683,17 @@ def merge(
     merged_data = data.merge_habits(target["id"], source_ids)
 
     # Count results
-    merged_entries = [e for e in merged_data["entries"] if e.get("habitId") == target["id"]]
-    console.print(f"\n[green]Merged into {len(merged_entries)} entries.[/green]")
+    merged_count = sum(1 for e in merged_data["entries"] if e.get("habitId") == target["id"])
+    console.print(f"\n[green]Merged into {merged_count} entries.[/green]")
 
-    # Output
-    output_json = json.dumps(merged_data, indent=2)
+    # Output - write orjson's bytes directly rather than round-tripping through str
     if output:
-        output.write_text(output_json)
+        output.write_bytes(orjson.dumps(merged_data, option=orjson.OPT_INDENT_2))
         console.print(f"[green]Written to {output}[/green]")
     else:
-        print(output_json)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(merged_data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        sys.stdout.buffer.flush()
 
 
 def main():
@@ -6,15 +6,26 @@
 #     "rich>=13.9.0",
 #     "typer>=0.9.0",
 #     "questionary>=2.0.0",
+#     "orjson>=3.10.0",
 #     "pytest>=8.0.0",
 #     "pytest-asyncio>=0.24.0",
+#     "pytest-xdist>=3.6.0",
 # ]
 # ///
 """Tests for Humane Tracker TUI using Textual's testing framework."""
 
+import copy
+import json
+import os
+from itertools import groupby
+from operator import itemgetter
+
+import orjson
 import pytest
 from textual.widgets import DataTable
+from typer.testing import CliRunner
 
+import humane_cli
 from humane_cli import (
     CategoriesScreen,
     EntriesScreen,
@@ -23,6 +34,9 @@ from humane_cli import (
     HumaneCLI,
     HumaneData,
     find_habits_by_name,
+    get_cache_path,
+    load_data,
+    max_entry_per_day,
 )
 
 # Test data fixture
@@ -56,10 +70,14 @@ TEST_DATA = {
 }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def humane_data():
-    """Create test HumaneData instance."""
-    return HumaneData(data=TEST_DATA)
+    """Create one test HumaneData instance shared by the module.
+
+    HumaneData is read-only after load, so sharing it is safe; the deep copy
+    keeps load-time normalization (id interning) off the TEST_DATA literal.
+    """
+    return HumaneData(data=copy.deepcopy(TEST_DATA))
 
 
 @pytest.fixture
@@ -68,9 +86,37 @@ def app(humane_data):
     return HumaneCLI(humane_data=humane_data)
 
 
+@pytest.mark.xdist_group("sync")
 class TestHumaneData:
     """Tests for HumaneData class."""
 
+    def test_load_from_file(self, tmp_path):
+        backup = tmp_path / "backup.json"
+        backup.write_text(json.dumps(TEST_DATA))
+
+        loaded = HumaneData(str(backup))
+        assert loaded.data == TEST_DATA
+        assert len(loaded.get_entries_for_habit("habit1")) == 2
+
+    def test_load_from_empty_file_raises(self, tmp_path):
+        backup = tmp_path / "empty.json"
+        backup.write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            HumaneData(str(backup))
+
+    def test_load_habit_without_name(self):
+        data = HumaneData(data={
+            "habits": [
+                {"id": "named", "name": "Named", "category": "fitness"},
+                {"id": "unnamed", "category": "fitness"},
+            ],
+            "entries": [],
+        })
+
+        assert data.get_habit_name("unnamed") == "Unknown"
+        assert [h["id"] for h in data.get_habits_by_category("fitness")] == ["unnamed", "named"]
+
     def test_get_categories(self, humane_data):
         categories = humane_data.get_categories()
         assert "fitness" in categories
@@ -92,6 +138,22 @@ class TestHumaneData:
         entries = humane_data.get_entries_for_habit("habit2")
         assert len(entries) == 1
 
+    def test_get_entries_for_habit_newest_first(self, humane_data):
+        entries = humane_data.get_entries_for_habit("habit1")
+        assert [e["date"] for e in entries] == ["2025-11-28", "2025-11-27"]
+
+    def test_get_habits_by_category_sorted_by_name(self, humane_data):
+        names = [h["name"] for h in humane_data.get_habits_by_category("fitness")]
+        assert names == ["Evening Walk", "Morning Run"]
+
+    def test_get_habits_by_category_uncategorized(self):
+        data = HumaneData(data={"habits": [{"id": "x", "name": "Loose"}], "entries": []})
+        assert [h["id"] for h in data.get_habits_by_category("uncategorized")] == ["x"]
+
+    def test_get_entries_for_habit_without_entries(self, humane_data):
+        assert humane_data.get_entries_for_habit("habit3") == ()
+        assert humane_data.get_entries_for_habit("nonexistent") == ()
+
     def test_get_habit_name(self, humane_data):
         assert humane_data.get_habit_name("habit1") == "Morning Run"
         assert humane_data.get_habit_name("nonexistent") == "Unknown"
@@ -102,11 +164,67 @@ class TestHumaneData:
         assert stats[0] == ("fitness", 2, 8)  # 3 + 5 = 8
         assert stats[1] == ("wellness", 1, 7)
 
+    def test_category_views_are_read_only(self, humane_data):
+        with pytest.raises(TypeError):
+            humane_data.get_categories()["fitness"] = ()
+        assert isinstance(humane_data.get_category_stats(), tuple)
+
+
+@pytest.mark.xdist_group("sync")
+class TestLoadData:
+    """Tests for load_data's parsed-backup cache."""
+
+    @pytest.fixture
+    def backup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(humane_cli, "CACHE_DIR", tmp_path / "cache")
+        path = tmp_path / "backup.json"
+        path.write_text(json.dumps(TEST_DATA))
+        return path
+
+    def test_writes_cache_on_first_load(self, backup):
+        data = load_data(backup)
+        assert get_cache_path(backup).exists()
+        assert data.get_habit_name("habit1") == "Morning Run"
+
+    def test_reuses_cache_for_unchanged_file(self, backup):
+        load_data(backup)
+        cached = load_data(backup)
+        assert cached.data == TEST_DATA
+        assert len(cached.get_entries_for_habit("habit1")) == 2
+
+    def test_changed_file_misses_cache(self, backup):
+        load_data(backup)
+        stale_path = get_cache_path(backup)
+
+        backup.write_text(json.dumps({**TEST_DATA, "entries": []}))
+        stat = backup.stat()
+        os.utime(backup, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert load_data(backup).get_entries_for_habit("habit1") == ()
+        # The stale entry is overwritten in place rather than left behind
+        assert list(stale_path.parent.glob("*.pkl")) == [stale_path]
+
+    def test_corrupt_cache_falls_back_to_parse(self, backup):
+        cache_path = get_cache_path(backup)
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_bytes(b"not a pickle")
+
+        assert load_data(backup).get_habit_name("habit2") == "Meditation"
+
+    def test_damaged_cache_pickle_falls_back_to_parse(self, backup):
+        load_data(backup)
+        cache_path = get_cache_path(backup)
+        # A flipped byte in the class name fails with AttributeError, not UnpicklingError
+        cache_path.write_bytes(cache_path.read_bytes().replace(b"HumaneData", b"HumaneDatX"))
+
+        assert load_data(backup).get_habit_name("habit2") == "Meditation"
+
 
 class TestCategoriesScreen:
     """Tests for CategoriesScreen."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
     async def test_categories_display(self, app):
         async with app.run_test() as pilot:
             # Should start on categories screen
@@ -116,7 +234,6 @@ class TestCategoriesScreen:
             table = app.screen.query_one("#categories-table", DataTable)
             assert table.row_count == 2  # fitness and wellness
 
-    @pytest.mark.asyncio
     async def test_navigate_with_j_k(self, app):
         async with app.run_test() as pilot:
             table = app.screen.query_one("#categories-table", DataTable)
@@ -132,7 +249,6 @@ class TestCategoriesScreen:
             await pilot.press("k")
             assert table.cursor_row == 0
 
-    @pytest.mark.asyncio
     async def test_select_with_enter(self, app):
         async with app.run_test() as pilot:
             # Press enter to select first category (fitness)
@@ -142,7 +258,6 @@ class TestCategoriesScreen:
             assert isinstance(app.screen, HabitsScreen)
             assert app.screen.category == "fitness"
 
-    @pytest.mark.asyncio
     async def test_select_with_l(self, app):
         async with app.run_test() as pilot:
             # Press l to select (vim right = enter)
@@ -150,7 +265,6 @@ class TestCategoriesScreen:
 
             assert isinstance(app.screen, HabitsScreen)
 
-    @pytest.mark.asyncio
     async def test_help_screen(self, app):
         async with app.run_test() as pilot:
             await pilot.press("?")
@@ -164,7 +278,8 @@ class TestCategoriesScreen:
 class TestHabitsScreen:
     """Tests for HabitsScreen."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
     async def test_habits_display(self, app):
         async with app.run_test() as pilot:
             # Navigate to fitness habits
@@ -174,7 +289,6 @@ class TestHabitsScreen:
             table = app.screen.query_one("#habits-table", DataTable)
             assert table.row_count == 2  # Morning Run and Evening Walk
 
-    @pytest.mark.asyncio
     async def test_back_with_h(self, app):
         async with app.run_test() as pilot:
             await pilot.press("enter")  # Go to habits
@@ -183,7 +297,6 @@ class TestHabitsScreen:
             await pilot.press("h")  # Go back
             assert isinstance(app.screen, CategoriesScreen)
 
-    @pytest.mark.asyncio
     async def test_back_with_escape(self, app):
         async with app.run_test() as pilot:
             await pilot.press("enter")
@@ -192,11 +305,9 @@ class TestHabitsScreen:
             await pilot.press("escape")
             assert isinstance(app.screen, CategoriesScreen)
 
-    @pytest.mark.asyncio
     async def test_navigate_to_entries(self, app):
         async with app.run_test() as pilot:
-            await pilot.press("enter")  # Go to habits
-            await pilot.press("enter")  # Go to entries
+            await pilot.press("enter", "enter")  # Go to habits, then entries
 
             assert isinstance(app.screen, EntriesScreen)
 
@@ -204,23 +315,31 @@ class TestHabitsScreen:
 class TestEntriesScreen:
     """Tests for EntriesScreen."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
     async def test_entries_display(self, app):
         async with app.run_test() as pilot:
             # Navigate to fitness -> first habit (Evening Walk, alphabetically)
-            await pilot.press("enter")
-            await pilot.press("enter")
+            await pilot.press("enter", "enter")
 
             assert isinstance(app.screen, EntriesScreen)
             table = app.screen.query_one("#entries-table", DataTable)
             # Evening Walk has no entries, so should show "No entries" row
             assert table.row_count >= 1
 
-    @pytest.mark.asyncio
+    async def test_entries_sorted_newest_first(self, app):
+        async with app.run_test() as pilot:
+            # fitness -> Morning Run (second alphabetically)
+            await pilot.press("enter", "j", "enter")
+
+            table = app.screen.query_one("#entries-table", DataTable)
+            assert table.row_count == 2
+            assert table.get_row_at(0)[0] == "2025-11-28"
+            assert table.get_row_at(1)[0] == "2025-11-27"
+
     async def test_back_navigation(self, app):
         async with app.run_test() as pilot:
-            await pilot.press("enter")  # Categories -> Habits
-            await pilot.press("enter")  # Habits -> Entries
+            await pilot.press("enter", "enter")  # Categories -> Habits -> Entries
 
             assert isinstance(app.screen, EntriesScreen)
 
@@ -230,7 +349,6 @@ class TestEntriesScreen:
             await pilot.press("h")  # Back to categories
             assert isinstance(app.screen, CategoriesScreen)
 
-    @pytest.mark.asyncio
     async def test_full_navigation_flow(self, app):
         """Test navigating categories -> habits -> entries -> back -> back."""
         async with app.run_test() as pilot:
@@ -238,8 +356,7 @@ class TestEntriesScreen:
             assert isinstance(app.screen, CategoriesScreen)
 
             # Go to habits (press j to go to wellness, then enter)
-            await pilot.press("j")  # Move to wellness
-            await pilot.press("l")  # Select with l
+            await pilot.press("j", "l")  # Move to wellness, select with l
 
             assert isinstance(app.screen, HabitsScreen)
             assert app.screen.category == "wellness"
@@ -260,17 +377,16 @@ class TestEntriesScreen:
 class TestQuit:
     """Tests for quit functionality."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
     async def test_quit_from_categories(self, app):
         async with app.run_test() as pilot:
             await pilot.press("q")
             # App should exit (no assertion needed, just shouldn't hang)
 
-    @pytest.mark.asyncio
     async def test_quit_from_habits(self, app):
         async with app.run_test() as pilot:
-            await pilot.press("enter")  # Go to habits
-            await pilot.press("q")
+            await pilot.press("enter", "q")  # Go to habits, then quit
             # App should exit
 
 
@@ -294,25 +410,44 @@ MERGE_TEST_DATA = {
         {"id": "e5", "habitId": "tgu-r", "date": "2025-11-28", "value": 6, "createdAt": "2025-11-28T12:00:00Z"},
         {"id": "e6", "habitId": "tgu-r", "date": "2025-11-25", "value": 7, "createdAt": "2025-11-25T10:00:00Z"},
         # KB entry (should be unaffected)
-        {"id": "e7", "habitId": "kb", "date": "2025-11-28", "value": 10, "createdAt": "2025-11-28T09:00:00Z"},
+        {
+            "id": "e7",
+            "habitId": "kb",
+            "date": "2025-11-28",
+            "value": 10,
+            "createdAt": "2025-11-28T09:00:00Z",
+            "notes": "Felt strong 💪 — naïve grip",
+        },
     ],
 }
 
 
+_habit_id = itemgetter("habitId")
+
+
+def group_by_habit(entries):
+    """Group merge output entries by habitId, keeping their relative order."""
+    return {k: list(g) for k, g in groupby(sorted(entries, key=_habit_id), key=_habit_id)}
+
+
+@pytest.fixture(scope="module")
+def merge_data():
+    """Shared HumaneData for merge tests; merge_habits returns new dicts, never mutates."""
+    return HumaneData(data=copy.deepcopy(MERGE_TEST_DATA))
+
+
+@pytest.mark.xdist_group("sync")
 class TestMergeHabits:
     """Tests for merge_habits functionality."""
 
-    @pytest.fixture
-    def merge_data(self):
-        return HumaneData(data=MERGE_TEST_DATA)
-
     def test_merge_takes_max_value_on_same_day(self, merge_data):
         """When multiple habits have entries on the same day, take max value."""
         result = merge_data.merge_habits("tgu", ["tgu-l", "tgu-r"])
 
         # Find the merged entry for 2025-11-28
-        merged_entries = [e for e in result["entries"] if e["habitId"] == "tgu"]
-        nov28_entry = next(e for e in merged_entries if e["date"] == "2025-11-28")
+        merged_entries = group_by_habit(result["entries"])["tgu"]
+        by_date = {e["date"]: e for e in merged_entries}
+        nov28_entry = by_date["2025-11-28"]
 
         # TGU had 5, TGU-L had 8, TGU-R had 6 -> max is 8
         assert nov28_entry["value"] == 8
@@ -321,17 +456,17 @@ class TestMergeHabits:
         """Entries on unique dates are preserved."""
         result = merge_data.merge_habits("tgu", ["tgu-l", "tgu-r"])
 
-        merged_entries = [e for e in result["entries"] if e["habitId"] == "tgu"]
-        dates = {e["date"] for e in merged_entries}
+        merged_entries = group_by_habit(result["entries"])["tgu"]
+        dates = dict.fromkeys(e["date"] for e in merged_entries)
 
         # Should have 11-28 (all three), 11-27 (tgu only), 11-26 (tgu-l), 11-25 (tgu-r)
-        assert dates == {"2025-11-28", "2025-11-27", "2025-11-26", "2025-11-25"}
+        assert dates.keys() == {"2025-11-28", "2025-11-27", "2025-11-26", "2025-11-25"}
 
     def test_merge_removes_source_habits(self, merge_data):
         """Source habits are removed from the habits list."""
         result = merge_data.merge_habits("tgu", ["tgu-l", "tgu-r"])
 
-        habit_ids = {h["id"] for h in result["habits"]}
+        habit_ids = dict.fromkeys(h["id"] for h in result["habits"])
         assert "tgu" in habit_ids
         assert "tgu-l" not in habit_ids
         assert "tgu-r" not in habit_ids
@@ -341,7 +476,7 @@ class TestMergeHabits:
         """Entries for habits not involved in merge are preserved."""
         result = merge_data.merge_habits("tgu", ["tgu-l", "tgu-r"])
 
-        kb_entries = [e for e in result["entries"] if e["habitId"] == "kb"]
+        kb_entries = group_by_habit(result["entries"])["kb"]
         assert len(kb_entries) == 1
         assert kb_entries[0]["value"] == 10
 
@@ -350,11 +485,43 @@ class TestMergeHabits:
         result = merge_data.merge_habits("tgu", ["tgu", "tgu-l"])
 
         # Should still work - tgu-l merged into tgu
-        habit_ids = {h["id"] for h in result["habits"]}
+        habit_ids = dict.fromkeys(h["id"] for h in result["habits"])
         assert "tgu" in habit_ids
         assert "tgu-l" not in habit_ids
         assert "tgu-r" in habit_ids  # Not merged
 
+        tgu_dates = sorted(map(itemgetter("date"), group_by_habit(result["entries"])["tgu"]))
+        assert tgu_dates == ["2025-11-26", "2025-11-27", "2025-11-28"]
+
+    def test_merge_tie_keeps_first_entry(self):
+        """On equal values for the same day, the first entry wins."""
+        data = HumaneData(data={
+            "habits": [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}],
+            "entries": [
+                {"id": "a1", "habitId": "a", "date": "2025-11-28T08:00:00Z", "value": 2},
+                {"id": "b1", "habitId": "b", "date": "2025-11-28T09:00:00Z", "value": 2},
+            ],
+        })
+        result = data.merge_habits("a", ["b"])
+
+        assert [e["id"] for e in result["entries"]] == ["a1"]
+        assert result["entries"][0]["date"] == "2025-11-28"
+
+    def test_merge_keeps_partial_values(self):
+        """Values are numbers, not ints: a 0.5 partial day survives a merge."""
+        data = HumaneData(data={
+            "habits": [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}],
+            "entries": [
+                {"id": "a1", "habitId": "a", "date": "2025-11-28", "value": 0.5},
+                {"id": "b1", "habitId": "b", "date": "2025-11-28", "value": 0},
+                {"id": "b2", "habitId": "b", "date": "2025-11-27", "value": 0.5},
+            ],
+        })
+        result = data.merge_habits("a", ["b"])
+
+        by_date = {e["date"]: e["value"] for e in result["entries"]}
+        assert by_date == {"2025-11-28": 0.5, "2025-11-27": 0.5}
+
     def test_merge_reassigns_entry_habit_ids(self, merge_data):
         """All merged entries have the target habit ID."""
         result = merge_data.merge_habits("tgu", ["tgu-l", "tgu-r"])
@@ -365,12 +532,82 @@ class TestMergeHabits:
             assert entry["habitId"] != "tgu-r"
 
 
-class TestFindHabitsByName:
-    """Tests for find_habits_by_name helper."""
+@pytest.mark.xdist_group("sync")
+class TestMergeCommand:
+    """Tests for the merge command's JSON output."""
 
     @pytest.fixture
-    def merge_data(self):
-        return HumaneData(data=MERGE_TEST_DATA)
+    def run_merge(self, tmp_path, monkeypatch):
+        """Run `merge` on MERGE_TEST_DATA with the prompts answered in advance."""
+        monkeypatch.setattr(humane_cli, "CACHE_DIR", tmp_path / "cache")
+        backup = tmp_path / "backup.json"
+        backup.write_bytes(orjson.dumps(MERGE_TEST_DATA))
+        habits = {h["id"]: h for h in MERGE_TEST_DATA["habits"]}
+
+        class Answer:
+            def __init__(self, value):
+                self.value = value
+
+            def ask(self):
+                return self.value
+
+        def run(target_id, source_ids, *args):
+            monkeypatch.setattr(humane_cli.questionary, "select", lambda *a, **k: Answer(habits[target_id]))
+            monkeypatch.setattr(
+                humane_cli.questionary, "checkbox", lambda *a, **k: Answer([habits[i] for i in source_ids])
+            )
+            monkeypatch.setattr(humane_cli.questionary, "confirm", lambda *a, **k: Answer(True))
+            return CliRunner().invoke(humane_cli.cli, ["merge", str(backup), *args])
+
+        return run
+
+    def test_merge_writes_output_file(self, run_merge, tmp_path):
+        output = tmp_path / "merged.json"
+        result = run_merge("tgu", ["tgu-l", "tgu-r"], "--output", str(output))
+
+        assert result.exit_code == 0
+        merged = orjson.loads(output.read_bytes())
+        assert {h["id"] for h in merged["habits"]} == {"tgu", "kb"}
+        assert sum(1 for e in merged["entries"] if e["habitId"] == "tgu") == 4
+
+    def test_merge_output_matches_stdlib_json_layout(self, run_merge, tmp_path):
+        output = tmp_path / "merged.json"
+        run_merge("tgu", ["tgu-l"], "-o", str(output))
+
+        # orjson writes raw UTF-8, so non-ASCII notes match ensure_ascii=False
+        merged = orjson.loads(output.read_bytes())
+        assert output.read_text(encoding="utf-8") == json.dumps(merged, indent=2, ensure_ascii=False)
+
+    def test_merge_writes_json_to_stdout(self, run_merge):
+        result = run_merge("tgu", ["tgu-l"])
+
+        assert result.exit_code == 0
+        merged = orjson.loads(result.output[result.output.index("{"):])
+        assert {h["id"] for h in merged["habits"]} == {"tgu", "tgu-r", "kb"}
+
+
+@pytest.mark.xdist_group("sync")
+class TestMaxEntryPerDay:
+    """Tests for max_entry_per_day helper."""
+
+    def test_keeps_max_value_per_day(self):
+        best = max_entry_per_day(MERGE_TEST_DATA["entries"])
+        assert best["2025-11-28"]["id"] == "e7"  # KB's 10 beats TGU-L's 8
+        assert best["2025-11-25"]["id"] == "e6"
+        assert len(best) == 4
+
+    def test_normalizes_timestamps_to_day(self):
+        best = max_entry_per_day([
+            {"id": "a", "date": "2025-11-28T08:00:00Z", "value": 1},
+            {"id": "b", "date": "2025-11-28T20:00:00Z", "value": 3},
+        ])
+        assert list(best) == ["2025-11-28"]
+        assert best["2025-11-28"]["id"] == "b"
+
+
+@pytest.mark.xdist_group("sync")
+class TestFindHabitsByName:
+    """Tests for find_habits_by_name helper."""
 
     def test_find_exact_match(self, merge_data):
         """Can find habit by exact name."""
@@ -396,6 +633,15 @@ class TestFindHabitsByName:
         assert len(results) == 1
         assert results[0]["name"] == "TGU-L"
 
+    def test_find_any_of_several_patterns(self, merge_data):
+        """Several patterns match habits containing any of them."""
+        results = find_habits_by_name(merge_data, "-l", "KETTLE")
+        assert [h["name"] for h in results] == ["TGU-L", "Kettlebell"]
+
+    def test_find_patterns_are_literal(self, merge_data):
+        """Regex metacharacters in patterns are matched literally."""
+        assert find_habits_by_name(merge_data, "tgu.", "k*") == []
+
     def test_find_no_match(self, merge_data):
         """Returns empty list when no match."""
         results = find_habits_by_name(merge_data, "nonexistent")